@@ -1,39 +1,43 @@
 """Configuration constants for the eBird hotspot guide."""
 
+import os
 from pathlib import Path
+from typing import Optional
 
 
-def find_ebird_files(data_dir: Path) -> tuple[Path, Path]:
+def find_ebird_files(data_dir: Path) -> tuple[Path, Optional[Path]]:
     """
     Auto-detect eBird data files in the given directory.
 
     Looks for:
     - Main file: ebd_*.txt (excluding *_sampling.txt)
-    - Sampling file: *_sampling.txt
+    - Sampling file: *_sampling.txt (optional; checklists are counted from
+      the main file when it is missing)
 
     Returns:
-        Tuple of (main_file, sampling_file) paths
+        Tuple of (main_file, sampling_file) paths; sampling_file is None
+        if there is no sampling file
 
     Raises:
-        FileNotFoundError if files cannot be found
+        FileNotFoundError if the main file cannot be found, or if either
+        file is ambiguous
     """
-    # Find sampling file
-    sampling_files = list(data_dir.glob("*_sampling.txt"))
-    if not sampling_files:
-        raise FileNotFoundError(
-            f"No sampling file (*_sampling.txt) found in {data_dir}"
-        )
+    # Only names are checked, so no per-file stat is needed
+    main_files = []
+    sampling_files = []
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith("_sampling.txt"):
+                sampling_files.append(Path(entry.path))
+            elif entry.name.startswith("ebd_") and entry.name.endswith(".txt"):
+                main_files.append(Path(entry.path))
+
     if len(sampling_files) > 1:
         raise FileNotFoundError(
             f"Multiple sampling files found in {data_dir}: {sampling_files}"
         )
-    sampling_file = sampling_files[0]
+    sampling_file = sampling_files[0] if sampling_files else None
 
-    # Find main file (ebd_*.txt but not *_sampling.txt)
-    main_files = [
-        f for f in data_dir.glob("ebd_*.txt")
-        if not f.name.endswith("_sampling.txt")
-    ]
     if not main_files:
         raise FileNotFoundError(
             f"No main data file (ebd_*.txt) found in {data_dir}"
@@ -50,13 +54,15 @@ def find_ebird_files(data_dir: Path) -> tuple[Path, Path]:
 # Paths
 DATA_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = DATA_DIR / "output"
+CACHE_DIR = OUTPUT_DIR / ".cache"  # Filtered rows as Parquet, reused across runs
 
 # Auto-detect data files
 MAIN_FILE, SAMPLING_FILE = find_ebird_files(DATA_DIR)
 
 # Processing parameters
-CHUNK_SIZE = 100000          # Rows per chunk for main file
-SAMPLING_CHUNK_SIZE = 50000  # Rows per chunk for sampling file
+READ_BLOCK_SIZE = 64 << 20   # Bytes per batch when reading TSV files
+MERGE_BUFFER_ROWS = 2000000  # Partial aggregate rows buffered before merging
+MAX_IN_FLIGHT_BYTES = 512 << 20  # Filtered batch bytes queued for aggregation
 
 # Confidence thresholds
 MIN_CHECKLISTS_THRESHOLD = 10   # Minimum checklists to include hotspot
@@ -93,9 +99,12 @@ MAIN_COLS = [
     'SCIENTIFIC NAME',
     'CATEGORY',
     'LOCALITY ID',
+    'LOCALITY',
     'LOCALITY TYPE',
+    'LATITUDE',
+    'LONGITUDE',
+    'OBSERVATION DATE',
     'SAMPLING EVENT IDENTIFIER',
     'ALL SPECIES REPORTED',
-    'OBSERVATION DATE',
     'OBSERVATION COUNT',
 ]
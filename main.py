@@ -17,10 +17,10 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import SAMPLING_FILE, MAIN_FILE, OUTPUT_DIR
+from config import MAIN_FILE, SAMPLING_FILE, OUTPUT_DIR
 from processors import (
     count_checklists_per_hotspot,
-    count_species_detections,
+    count_checklists_and_detections,
     calculate_occurrence_rates,
 )
 from output import (
@@ -46,32 +46,50 @@ def main():
     logger.info("=" * 60)
     logger.info(f"Data directory: {MAIN_FILE.parent}")
     logger.info(f"Main file: {MAIN_FILE.name}")
-    logger.info(f"Sampling file: {SAMPLING_FILE.name}")
+    if SAMPLING_FILE is not None:
+        logger.info(f"Sampling file: {SAMPLING_FILE.name}")
 
     # Verify input files exist
-    if not SAMPLING_FILE.exists():
-        logger.error(f"Sampling file not found: {SAMPLING_FILE}")
-        sys.exit(1)
-
     if not MAIN_FILE.exists():
         logger.error(f"Main data file not found: {MAIN_FILE}")
         sys.exit(1)
 
-    # Step 1: Count complete checklists per hotspot (from sampling file)
+    # Step 1: Count species detections, and checklists as seen in the main file
     logger.info("")
-    logger.info("Step 1: Counting checklists per hotspot from sampling file...")
-    hotspot_data = count_checklists_per_hotspot(SAMPLING_FILE)
-    logger.info(f"  Found {len(hotspot_data)} hotspots with complete checklists")
+    logger.info("Step 1: Counting species detections from main file...")
+    logger.info("  (This may take several minutes for large files)")
+    main_hotspot_data, species_detections = count_checklists_and_detections(MAIN_FILE)
+    logger.info(f"  Found {len(species_detections)} unique species")
 
-    total_checklists = sum(h['total_checklists'] for h in hotspot_data.values())
-    logger.info(f"  Total complete checklists at hotspots: {total_checklists:,}")
+    main_checklists = sum(h['total_checklists'] for h in main_hotspot_data.values())
 
-    # Step 2: Count species detections per hotspot (from main file)
+    # Step 2: Count complete checklists per hotspot. The sampling file lists
+    # every checklist; the main file misses checklists whose only records are
+    # sensitive species, and all checklists outside a species-filtered download.
     logger.info("")
-    logger.info("Step 2: Counting species detections from main file...")
-    logger.info("  (This may take several minutes for large files)")
-    species_detections = count_species_detections(MAIN_FILE)
-    logger.info(f"  Found {len(species_detections)} unique species")
+    if SAMPLING_FILE is not None:
+        logger.info("Step 2: Counting checklists per hotspot from sampling file...")
+        hotspot_data = count_checklists_per_hotspot(SAMPLING_FILE)
+        total_checklists = sum(h['total_checklists'] for h in hotspot_data.values())
+        if main_checklists != total_checklists:
+            logger.warning(
+                f"  Main file has {main_checklists:,} complete checklists at hotspots, "
+                f"sampling file has {total_checklists:,}; using the sampling file"
+            )
+    else:
+        logger.warning(
+            "Step 2: No sampling file (*_sampling.txt) found; counting checklists "
+            "from the main file instead"
+        )
+        logger.warning(
+            "  Checklists with only sensitive species are missed, and occurrence "
+            "rates are inflated for species-filtered downloads"
+        )
+        hotspot_data = main_hotspot_data
+        total_checklists = main_checklists
+
+    logger.info(f"  Found {len(hotspot_data)} hotspots with complete checklists")
+    logger.info(f"  Total complete checklists at hotspots: {total_checklists:,}")
 
     # Step 3: Calculate occurrence rates
     logger.info("")
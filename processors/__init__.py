@@ -1,11 +1,11 @@
 """Processors for eBird data analysis."""
 
 from .checklist_counter import count_checklists_per_hotspot
-from .species_detector import count_species_detections
+from .observation_pass import count_checklists_and_detections
 from .occurrence_calculator import calculate_occurrence_rates
 
 __all__ = [
     'count_checklists_per_hotspot',
-    'count_species_detections',
+    'count_checklists_and_detections',
     'calculate_occurrence_rates',
 ]
@@ -1,19 +1,128 @@
-"""Count complete checklists per hotspot from the sampling file."""
+"""Count complete checklists per hotspot from the sampling or main file."""
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
-from typing import Dict, Any
-from tqdm import tqdm
+from typing import Dict, Any, List
 
-from config import SAMPLING_COLS, SAMPLING_CHUNK_SIZE
+from config import SAMPLING_COLS
+from .tsv_reader import read_filtered_batches
 
 
-def count_checklists_per_hotspot(sampling_file: Path) -> Dict[str, Dict[str, Any]]:
+CHECKLIST_KEYS = ['LOCALITY ID', 'checklist_id', 'month']
+COUNT_KEYS = ['LOCALITY ID', 'month']
+META_COLS = ['LOCALITY', 'LATITUDE', 'LONGITUDE']
+
+SAMPLING_CACHE_NAME = 'sampling_filtered'
+# Bump whenever _checklist_filter changes, to invalidate the cache
+SAMPLING_FILTER_VERSION = 1
+
+
+def _checklist_filter(batch: pa.RecordBatch) -> pa.Array:
+    """Mask of complete checklists at hotspots."""
+    return pc.and_(
+        pc.equal(batch['LOCALITY TYPE'], 'H'),
+        pc.equal(batch['ALL SPECIES REPORTED'], 1),
+    )
+
+
+def aggregate_checklists(batch: pa.RecordBatch) -> pa.Table:
     """
-    Read the sampling file and count complete checklists per hotspot.
+    Reduce one batch of complete hotspot checklist rows to distinct checklists.
+
+    The main file has one row per observation, so a checklist appears once per
+    taxon reported. Checklist IDs ('S' + digits) are kept as int64.
+    """
+    checklists = pa.table({
+        'LOCALITY ID': batch['LOCALITY ID'],
+        'checklist_id': pc.utf8_slice_codeunits(
+            batch['SAMPLING EVENT IDENTIFIER'], 1
+        ).cast(pa.int64()),
+        # Month from ISO dates (YYYY-MM-DD) without datetime parsing
+        'month': pc.utf8_slice_codeunits(batch['OBSERVATION DATE'], 5, 7).cast(pa.int8()),
+    })
+    return checklists.group_by(CHECKLIST_KEYS).aggregate([])
+
+
+def merge_checklists(partials: List[pa.Table]) -> pa.Table:
+    """Deduplicate checklists across partial results."""
+    # Each batch has its own dictionaries for the key columns; unify them
+    # so the keys can be grouped across batches
+    table = pa.concat_tables(partials).unify_dictionaries()
+    return table.group_by(CHECKLIST_KEYS).aggregate([])
+
+
+def _counts_table(agg: pa.Table, count_col: str) -> pa.Table:
+    """Select checklist count aggregate columns under stable names."""
+    return pa.table({
+        **{key: agg[key] for key in COUNT_KEYS},
+        'checklists': agg[count_col],
+    })
+
+
+def count_distinct_checklists(checklists: pa.Table) -> pa.Table:
+    """Count distinct checklists from merge_checklists per hotspot and month."""
+    agg = checklists.group_by(COUNT_KEYS).aggregate([([], 'count_all')])
+    return _counts_table(agg, 'count_all')
+
+
+def aggregate_sampling_checklists(batch: pa.RecordBatch) -> pa.Table:
+    """
+    Count one batch of sampling file rows by hotspot and month.
+
+    The sampling file has one row per checklist, so the row count is the
+    checklist count.
+    """
+    checklists = pa.table({
+        'LOCALITY ID': batch['LOCALITY ID'],
+        # Month from ISO dates (YYYY-MM-DD) without datetime parsing
+        'month': pc.utf8_slice_codeunits(batch['OBSERVATION DATE'], 5, 7).cast(pa.int8()),
+    })
+    agg = checklists.group_by(COUNT_KEYS).aggregate([([], 'count_all')])
+    return _counts_table(agg, 'count_all')
+
+
+def merge_checklist_counts(partials: List[pa.Table]) -> pa.Table:
+    """Sum partial checklist counts into a single row per hotspot and month."""
+    table = pa.concat_tables(partials).unify_dictionaries()
+    agg = table.group_by(COUNT_KEYS).aggregate([('checklists', 'sum')])
+    return _counts_table(agg, 'checklists_sum')
+
+
+def _meta_table(agg: pa.Table) -> pa.Table:
+    """Select metadata aggregate columns under their original names."""
+    return pa.table({
+        'LOCALITY ID': agg['LOCALITY ID'],
+        **{col: agg[f'{col}_min'] for col in META_COLS},
+    })
+
+
+def aggregate_hotspot_meta(batch: pa.RecordBatch) -> pa.Table:
+    """
+    Collect hotspot name and coordinates from one batch.
+
+    These are fixed per hotspot, so 'min' simply picks them up.
+    """
+    table = pa.table({col: batch[col] for col in ['LOCALITY ID'] + META_COLS})
+    agg = table.group_by('LOCALITY ID').aggregate([(col, 'min') for col in META_COLS])
+    return _meta_table(agg)
+
+
+def merge_hotspot_meta(partials: List[pa.Table]) -> pa.Table:
+    """Combine partial hotspot metadata into a single row per hotspot."""
+    table = pa.concat_tables(partials).unify_dictionaries()
+    agg = table.group_by('LOCALITY ID').aggregate([(col, 'min') for col in META_COLS])
+    return _meta_table(agg)
+
+
+def build_hotspot_data(counts: pa.Table, meta: pa.Table) -> Dict[str, Dict[str, Any]]:
+    """
+    Convert checklist counts per hotspot and month to hotspot dictionaries.
 
     Args:
-        sampling_file: Path to the sampling events file
+        counts: Checklist counts from count_distinct_checklists or
+            merge_checklist_counts
+        meta: Hotspot metadata from merge_hotspot_meta
 
     Returns:
         Dictionary mapping locality_id to hotspot metadata:
@@ -29,50 +138,59 @@ def count_checklists_per_hotspot(sampling_file: Path) -> Dict[str, Dict[str, Any
     """
     hotspot_data: Dict[str, Dict[str, Any]] = {}
 
-    # Count total rows for progress bar
-    total_rows = sum(1 for _ in open(sampling_file, 'r', encoding='utf-8')) - 1
-
-    chunks = pd.read_csv(
-        sampling_file,
-        sep='\t',
-        usecols=SAMPLING_COLS,
-        chunksize=SAMPLING_CHUNK_SIZE,
-        dtype={
-            'ALL SPECIES REPORTED': 'Int64',
-            'LOCALITY TYPE': 'category',
-        },
-        encoding='utf-8',
-    )
+    for loc_id, name, latitude, longitude in zip(
+        meta['LOCALITY ID'].to_pylist(),
+        meta['LOCALITY'].to_pylist(),
+        meta['LATITUDE'].to_pylist(),
+        meta['LONGITUDE'].to_pylist(),
+    ):
+        hotspot_data[loc_id] = {
+            'name': name,
+            'latitude': latitude,
+            'longitude': longitude,
+            'total_checklists': 0,
+            'monthly_checklists': {m: 0 for m in range(1, 13)},
+        }
 
-    rows_processed = 0
-    with tqdm(total=total_rows, desc="Reading sampling file") as pbar:
-        for chunk in chunks:
-            # Filter for complete checklists at hotspots
-            mask = (chunk['LOCALITY TYPE'] == 'H') & (chunk['ALL SPECIES REPORTED'] == 1)
-            filtered = chunk[mask]
-
-            # Parse dates
-            filtered = filtered.copy()
-            filtered['month'] = pd.to_datetime(filtered['OBSERVATION DATE']).dt.month
-
-            # Aggregate by hotspot
-            for _, row in filtered.iterrows():
-                loc_id = row['LOCALITY ID']
-                month = row['month']
-
-                if loc_id not in hotspot_data:
-                    hotspot_data[loc_id] = {
-                        'name': row['LOCALITY'],
-                        'latitude': float(row['LATITUDE']),
-                        'longitude': float(row['LONGITUDE']),
-                        'total_checklists': 0,
-                        'monthly_checklists': {m: 0 for m in range(1, 13)},
-                    }
-
-                hotspot_data[loc_id]['total_checklists'] += 1
-                hotspot_data[loc_id]['monthly_checklists'][month] += 1
-
-            rows_processed += len(chunk)
-            pbar.update(len(chunk))
+    for loc_id, month, count in zip(
+        counts['LOCALITY ID'].to_pylist(),
+        counts['month'].to_pylist(),
+        counts['checklists'].to_pylist(),
+    ):
+        hotspot = hotspot_data[loc_id]
+        hotspot['total_checklists'] += count
+        hotspot['monthly_checklists'][month] += count
 
     return hotspot_data
+
+
+def count_checklists_per_hotspot(sampling_file: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the sampling file and count complete checklists per hotspot.
+
+    Only the SAMPLING_COLS are read. Unlike the main file, the sampling file
+    lists every checklist, including those whose only records are sensitive
+    species and those outside a species-filtered download.
+
+    Args:
+        sampling_file: Path to the sampling events file
+
+    Returns:
+        Dictionary mapping locality_id to hotspot metadata; see
+        build_hotspot_data
+    """
+    counts: List[pa.Table] = []
+    meta: List[pa.Table] = []
+    batches = read_filtered_batches(
+        sampling_file, SAMPLING_COLS, _checklist_filter, SAMPLING_FILTER_VERSION,
+        SAMPLING_CACHE_NAME, "Reading sampling file",
+    )
+    # Per-batch results are small (hotspots x months), so they are merged
+    # once at the end
+    for batch in batches:
+        counts.append(aggregate_sampling_checklists(batch))
+        meta.append(aggregate_hotspot_meta(batch))
+
+    if not counts:
+        return {}
+    return build_hotspot_data(merge_checklist_counts(counts), merge_hotspot_meta(meta))
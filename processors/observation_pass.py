@@ -0,0 +1,157 @@
+"""Count checklists and species detections in a single pass over the main file."""
+
+import os
+import pyarrow as pa
+import pyarrow.compute as pc
+from pathlib import Path
+from typing import Callable, Dict, Any, Deque, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import MAIN_COLS, MERGE_BUFFER_ROWS, MAX_IN_FLIGHT_BYTES
+from .checklist_counter import (
+    aggregate_checklists,
+    merge_checklists,
+    count_distinct_checklists,
+    aggregate_hotspot_meta,
+    merge_hotspot_meta,
+    build_hotspot_data,
+    SAMPLING_CACHE_NAME,
+)
+from .species_detector import (
+    aggregate_detections,
+    merge_detections,
+    build_species_detections,
+)
+from .tsv_reader import read_filtered_batches, remove_unused_caches
+
+BatchPartials = Tuple[pa.Table, pa.Table, pa.Table]
+
+CACHE_NAME = 'main_filtered'
+# Bump whenever _complete_hotspot_filter changes, to invalidate the cache
+FILTER_VERSION = 1
+
+
+def _complete_hotspot_filter(batch: pa.RecordBatch) -> pa.Array:
+    """
+    Mask of rows to keep:
+    - Hotspots only (LOCALITY TYPE = 'H')
+    - Complete checklists (ALL SPECIES REPORTED = 1)
+
+    All taxa are kept so that every checklist is counted; species-level
+    filtering happens in aggregate_detections.
+    """
+    return pc.and_(
+        pc.equal(batch['LOCALITY TYPE'], 'H'),
+        pc.equal(batch['ALL SPECIES REPORTED'], 1),
+    )
+
+
+def _aggregate_batch(batch: pa.RecordBatch) -> BatchPartials:
+    """Compute all partial aggregates for one batch."""
+    return (
+        aggregate_checklists(batch),
+        aggregate_hotspot_meta(batch),
+        aggregate_detections(batch),
+    )
+
+
+def _aggregate_batches(batches: Iterator[pa.RecordBatch]) -> Iterator[BatchPartials]:
+    """
+    Aggregate batches on a thread pool, yielding partials in input order.
+
+    Arrow compute releases the GIL, so threads give real parallelism without
+    pickling batches to other processes. To bound memory, at most two batches
+    per worker and MAX_IN_FLIGHT_BYTES of batch data are in flight; a single
+    batch larger than that is still processed on its own.
+    """
+    workers = max(1, (os.cpu_count() or 1) - 1)
+    pending: Deque[Tuple[Future, int]] = deque()
+    in_flight_bytes = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch in batches:
+            pending.append((executor.submit(_aggregate_batch, batch), batch.nbytes))
+            in_flight_bytes += batch.nbytes
+            while pending and (
+                len(pending) >= 2 * workers or in_flight_bytes > MAX_IN_FLIGHT_BYTES
+            ):
+                future, nbytes = pending.popleft()
+                in_flight_bytes -= nbytes
+                yield future.result()
+
+        while pending:
+            future, _ = pending.popleft()
+            yield future.result()
+
+
+class _PartialBuffer:
+    """
+    Buffer partial aggregates and merge them in Arrow.
+
+    Merges once the buffer outgrows the merged table, so the cost of merging
+    stays proportional to the data read.
+    """
+
+    def __init__(self, merge: Callable[[List[pa.Table]], pa.Table]):
+        self.merge = merge
+        self.partials: List[pa.Table] = []
+        self.merged_rows = 0
+        self.buffered_rows = 0
+
+    def add(self, partial: pa.Table) -> None:
+        self.partials.append(partial)
+        self.buffered_rows += partial.num_rows
+        if self.buffered_rows >= max(MERGE_BUFFER_ROWS, self.merged_rows):
+            self.partials = [self.merge(self.partials)]
+            self.merged_rows = self.partials[0].num_rows
+            self.buffered_rows = 0
+
+    def result(self) -> Optional[pa.Table]:
+        return self.merge(self.partials) if self.partials else None
+
+
+def count_checklists_and_detections(
+    main_file: Path,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, Any]]]]:
+    """
+    Read the main observations file once and count both complete checklists
+    per hotspot and species detections per hotspot.
+
+    A complete checklist appears in the main file once per taxon reported,
+    so distinct SAMPLING EVENT IDENTIFIERs per hotspot count checklists.
+    Checklists with no records in the main file are missed: those with only
+    sensitive species, which the EBD withholds, and any outside a
+    species-filtered download. Prefer count_checklists_per_hotspot on the
+    sampling file when it is available.
+
+    Args:
+        main_file: Path to the main eBird observations file
+
+    Returns:
+        Tuple of (hotspot_data, species_detections); see build_hotspot_data
+        and build_species_detections for their structure
+    """
+    checklists = _PartialBuffer(merge_checklists)
+    meta = _PartialBuffer(merge_hotspot_meta)
+    detections = _PartialBuffer(merge_detections)
+
+    remove_unused_caches([CACHE_NAME, SAMPLING_CACHE_NAME])
+    batches = read_filtered_batches(
+        main_file, MAIN_COLS, _complete_hotspot_filter, FILTER_VERSION,
+        CACHE_NAME, "Reading main file",
+    )
+    for checklist_partial, meta_partial, detection_partial in _aggregate_batches(batches):
+        checklists.add(checklist_partial)
+        meta.add(meta_partial)
+        detections.add(detection_partial)
+
+    checklist_result = checklists.result()
+    if checklist_result is None:
+        return {}, {}
+
+    hotspot_data = build_hotspot_data(
+        count_distinct_checklists(checklist_result), meta.result()
+    )
+    species_detections = build_species_detections(detections.result())
+    return hotspot_data, species_detections
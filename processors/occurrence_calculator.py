@@ -1,7 +1,8 @@
 """Calculate occurrence rates for species at hotspots."""
 
+import numpy as np
 from typing import Dict, Any, List
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from config import (
     MIN_CHECKLISTS_THRESHOLD,
@@ -12,7 +13,7 @@ from config import (
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpeciesAtHotspot:
     """Data for a species occurrence at a specific hotspot."""
     locality_id: str
@@ -29,14 +30,14 @@ class SpeciesAtHotspot:
     confidence_level: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpeciesGuide:
     """Complete guide for a single species."""
     common_name: str
     scientific_name: str
     total_detections: int
     total_hotspots_detected: int
-    hotspots: List[SpeciesAtHotspot] = field(default_factory=list)
+    hotspots: List[SpeciesAtHotspot]
 
 
 def get_months_for_season(season: str) -> List[int]:
@@ -74,89 +75,109 @@ def calculate_occurrence_rates(
     """
     species_guides: Dict[str, SpeciesGuide] = {}
 
+    # Hotspot data as parallel arrays (one row per hotspot), so per-species
+    # work below is array arithmetic rather than per-hotspot dict lookups
+    loc_index = {loc_id: i for i, loc_id in enumerate(hotspot_data)}
+    hotspots = list(hotspot_data.values())
+    total_checklists = np.array(
+        [h['total_checklists'] for h in hotspots], dtype=np.int64
+    )
+    monthly_checklists = np.array(
+        [[h['monthly_checklists'].get(m, 0) for m in range(13)] for h in hotspots],
+        dtype=np.int64,
+    ).reshape(len(hotspots), 13)
+    seasonal_checklists = {
+        season_name: monthly_checklists[:, months].sum(axis=1)
+        for season_name, months in SEASONS.items()
+    }
+    # Confidence depends only on the hotspot, so assign it once per hotspot
+    confidence_levels = [determine_confidence(h['total_checklists']) for h in hotspots]
+
     for species_name, hotspot_detections in species_detections.items():
+        # Hotspots in our hotspot data with enough checklists
+        loc_ids = [
+            loc_id for loc_id in hotspot_detections
+            if loc_id in loc_index
+            and total_checklists[loc_index[loc_id]] >= min_checklists
+        ]
+        rows = np.array([loc_index[loc_id] for loc_id in loc_ids], dtype=np.intp)
+        detections = [hotspot_detections[loc_id] for loc_id in loc_ids]
+
+        # Get scientific name from first detection
+        scientific_name = detections[0]['scientific_name'] if detections else None
+
+        detection_count = np.array(
+            [d['checklist_count'] for d in detections], dtype=np.int64
+        )
+        monthly_detections = np.array(
+            [d['monthly_checklist_counts'] for d in detections], dtype=np.int64
+        ).reshape(len(detections), 13)
+        occurrence_rate = np.array([
+            round(rate, RATE_DECIMAL_PLACES)
+            for rate in (detection_count / total_checklists[rows]).tolist()
+        ])
+
+        # Seasonal rates (lower threshold for seasonal)
+        seasonal = {}
+        for season_name, months in SEASONS.items():
+            checklists = seasonal_checklists[season_name][rows]
+            rates = monthly_detections[:, months].sum(axis=1) / np.maximum(checklists, 1)
+            seasonal[season_name] = ((checklists >= 5).tolist(), rates.tolist())
+
+        # Monthly rates (lower threshold for monthly)
+        month_checklists = monthly_checklists[rows]
+        month_valid = (month_checklists >= 3).tolist()
+        month_rates = (monthly_detections / np.maximum(month_checklists, 1)).tolist()
+
+        # Sort by occurrence rate (descending), then by detection count, then
+        # by locality ID so that ties rank the same on every run
+        order = np.lexsort((np.array(loc_ids), -detection_count, -occurrence_rate))
+
         hotspots_list: List[SpeciesAtHotspot] = []
-        total_detections = 0
-        scientific_name = None
-
-        for loc_id, detection_data in hotspot_detections.items():
-            # Skip if hotspot not in our hotspot data
-            if loc_id not in hotspot_data:
-                continue
-
-            hotspot = hotspot_data[loc_id]
-
-            # Skip hotspots below confidence threshold
-            if hotspot['total_checklists'] < min_checklists:
-                continue
-
-            # Get scientific name from first detection
-            if scientific_name is None:
-                scientific_name = detection_data['scientific_name']
-
-            detection_count = len(detection_data['checklist_ids'])
-            total_detections += detection_count
-            occurrence_rate = detection_count / hotspot['total_checklists']
-
-            # Calculate seasonal rates
-            seasonal_rates: Dict[str, float] = {}
-            for season_name, months in SEASONS.items():
-                seasonal_checklists = sum(
-                    hotspot['monthly_checklists'].get(m, 0) for m in months
-                )
-                if seasonal_checklists >= 5:  # Lower threshold for seasonal
-                    seasonal_detections = sum(
-                        len(detection_data['monthly_checklist_ids'].get(m, set()))
-                        for m in months
-                    )
-                    rate = seasonal_detections / seasonal_checklists
-                    seasonal_rates[season_name] = round(rate, RATE_DECIMAL_PLACES)
-
-            # Calculate monthly rates
-            monthly_rates: Dict[int, float] = {}
-            for month in range(1, 13):
-                month_checklists = hotspot['monthly_checklists'].get(month, 0)
-                if month_checklists >= 3:  # Lower threshold for monthly
-                    month_detections = len(
-                        detection_data['monthly_checklist_ids'].get(month, set())
-                    )
-                    rate = month_detections / month_checklists
-                    monthly_rates[month] = round(rate, RATE_DECIMAL_PLACES)
+        for i in order.tolist():
+            loc_id = loc_ids[i]
+            row = rows[i]
+            hotspot = hotspots[row]
+            detection_data = detections[i]
+            count = int(detection_count[i])
+
+            seasonal_rates: Dict[str, float] = {
+                season_name: round(rates[i], RATE_DECIMAL_PLACES)
+                for season_name, (valid, rates) in seasonal.items()
+                if valid[i]
+            }
+            monthly_rates: Dict[int, float] = {
+                month: round(month_rates[i][month], RATE_DECIMAL_PLACES)
+                for month in range(1, 13)
+                if month_valid[i][month]
+            }
 
             # Calculate average count when present
             avg_count = None
-            if detection_count > 0 and detection_data['total_count'] > 0:
-                avg_count = round(detection_data['total_count'] / detection_count, 1)
+            if count > 0 and detection_data['total_count'] > 0:
+                avg_count = round(detection_data['total_count'] / count, 1)
 
             max_count = detection_data['max_count'] if detection_data['max_count'] > 0 else None
 
-            confidence = determine_confidence(hotspot['total_checklists'])
-
             hotspots_list.append(SpeciesAtHotspot(
                 locality_id=loc_id,
                 hotspot_name=hotspot['name'],
                 latitude=hotspot['latitude'],
                 longitude=hotspot['longitude'],
-                detection_count=detection_count,
+                detection_count=count,
                 total_checklists=hotspot['total_checklists'],
-                occurrence_rate=round(occurrence_rate, RATE_DECIMAL_PLACES),
+                occurrence_rate=float(occurrence_rate[i]),
                 avg_count=avg_count,
                 max_count=max_count,
                 seasonal_rates=seasonal_rates,
                 monthly_rates=monthly_rates,
-                confidence_level=confidence,
+                confidence_level=confidence_levels[row],
             ))
 
-        # Sort by occurrence rate (descending), then by detection count
-        hotspots_list.sort(
-            key=lambda x: (x.occurrence_rate, x.detection_count),
-            reverse=True
-        )
-
         species_guides[species_name] = SpeciesGuide(
             common_name=species_name,
             scientific_name=scientific_name or '',
-            total_detections=total_detections,
+            total_detections=int(detection_count.sum()),
             total_hotspots_detected=len(hotspots_list),
             hotspots=hotspots_list,
         )
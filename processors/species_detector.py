@@ -1,20 +1,95 @@
-"""Count species detections per hotspot from the main observations file."""
+"""Count species detections per hotspot from observation batches."""
 
-import pandas as pd
-from pathlib import Path
-from typing import Dict, Any, Set
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, Any, List
 from collections import defaultdict
-from tqdm import tqdm
 
-from config import MAIN_COLS, CHUNK_SIZE
 
+GROUP_KEYS = ['COMMON NAME', 'LOCALITY ID', 'month']
 
-def count_species_detections(main_file: Path) -> Dict[str, Dict[str, Dict[str, Any]]]:
+
+def _partial_table(agg: pa.Table, count_col: str, name_col: str,
+                   total_col: str, max_col: str) -> pa.Table:
+    """Select aggregate columns under stable names."""
+    return pa.table({
+        **{key: agg[key] for key in GROUP_KEYS},
+        'checklist_count': agg[count_col],
+        'scientific_name': agg[name_col],
+        'total_count': agg[total_col],
+        'max_count': agg[max_col],
+    })
+
+
+def aggregate_detections(batch: pa.RecordBatch) -> pa.Table:
+    """
+    Aggregate one batch of complete hotspot checklist rows by species,
+    hotspot and month.
+
+    Only species-level taxa (CATEGORY = 'species') are counted. The EBD has
+    one row per species per checklist, so the row count is the number of
+    checklists with a detection. The scientific name is fixed per species,
+    so 'min' simply picks it up.
+
+    Only observation counts of 1 to 18 plain ASCII digits are summed; 'X'
+    (presence-only) and anything else, including other Unicode digits and
+    signed values such as '+5', count as no number. The 18-digit cap keeps
+    the int64 cast from overflowing on bad input.
+    """
+    filtered = batch.filter(pc.equal(batch['CATEGORY'], 'species'))
+
+    # Month from ISO dates (YYYY-MM-DD) without datetime parsing;
+    # observation counts that are not plain ASCII digits become null
+    counts = filtered['OBSERVATION COUNT']
+    obs = pa.table({
+        'COMMON NAME': filtered['COMMON NAME'],
+        'SCIENTIFIC NAME': filtered['SCIENTIFIC NAME'],
+        'LOCALITY ID': filtered['LOCALITY ID'],
+        'month': pc.utf8_slice_codeunits(filtered['OBSERVATION DATE'], 5, 7).cast(pa.int8()),
+        'obs_num': pc.if_else(
+            pc.match_substring_regex(counts, r'^[0-9]{1,18}$'),
+            counts,
+            pa.scalar(None, pa.string()),
+        ).cast(pa.int64()),
+    })
+
+    agg = obs.group_by(GROUP_KEYS).aggregate([
+        ([], 'count_all'),
+        ('SCIENTIFIC NAME', 'min'),
+        ('obs_num', 'sum'),
+        ('obs_num', 'max'),
+    ])
+    return _partial_table(
+        agg, 'count_all', 'SCIENTIFIC NAME_min', 'obs_num_sum', 'obs_num_max'
+    )
+
+
+def merge_detections(partials: List[pa.Table]) -> pa.Table:
+    """Combine partial detection aggregates into a single row per group."""
+    # Each batch has its own dictionaries for the key columns; unify them
+    # so the keys can be grouped across batches
+    table = pa.concat_tables(partials).unify_dictionaries()
+    agg = table.group_by(GROUP_KEYS).aggregate([
+        ('checklist_count', 'sum'),
+        ('scientific_name', 'min'),
+        ('total_count', 'sum'),
+        ('max_count', 'max'),
+    ])
+    return _partial_table(
+        agg, 'checklist_count_sum', 'scientific_name_min',
+        'total_count_sum', 'max_count_max',
+    )
+
+
+def build_species_detections(result: pa.Table) -> Dict[str, Dict[str, Dict[str, Any]]]:
     """
-    Read the main observations file and count species detections per hotspot.
+    Convert merged detection aggregates to the nested detection dictionary.
+
+    monthly_checklist_counts is indexed by month number (index 0 is unused).
 
     Args:
-        main_file: Path to the main eBird observations file
+        result: Merged aggregates from merge_detections
 
     Returns:
         Nested dictionary: species -> locality_id -> detection data
@@ -22,90 +97,58 @@ def count_species_detections(main_file: Path) -> Dict[str, Dict[str, Dict[str, A
             'American Robin': {
                 'L123456': {
                     'scientific_name': 'Turdus migratorius',
-                    'checklist_ids': {'S123', 'S456', ...},
-                    'monthly_checklist_ids': {1: {'S123'}, 2: {...}, ...},
+                    'checklist_count': 21,
+                    'monthly_checklist_counts': array([0, 12, 9, ...]),
                     'total_count': 150,
                     'max_count': 25
                 }
             }
         }
     """
-    # Nested defaultdict for species -> locality -> detection data
-    species_detections: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(
-        lambda: defaultdict(lambda: {
-            'scientific_name': None,
-            'checklist_ids': set(),
-            'monthly_checklist_ids': {m: set() for m in range(1, 13)},
-            'total_count': 0,
-            'max_count': 0,
-        })
-    )
+    species_detections: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+
+    # Roll months up to one row per (species, hotspot) pair, in Arrow
+    pair_keys = ['COMMON NAME', 'LOCALITY ID']
+    pairs = result.group_by(pair_keys).aggregate([
+        ('checklist_count', 'sum'),
+        ('scientific_name', 'min'),
+        ('total_count', 'sum'),
+        ('max_count', 'max'),
+    ])
 
-    # Count total rows for progress bar
-    print("Counting rows in main file (this may take a moment)...")
-    total_rows = sum(1 for _ in open(main_file, 'r', encoding='utf-8')) - 1
-    print(f"Total rows: {total_rows:,}")
-
-    chunks = pd.read_csv(
-        main_file,
-        sep='\t',
-        usecols=MAIN_COLS,
-        chunksize=CHUNK_SIZE,
-        dtype={
-            'ALL SPECIES REPORTED': 'Int64',
-            'LOCALITY TYPE': 'category',
-            'CATEGORY': 'category',
-        },
-        encoding='utf-8',
-        low_memory=False,
+    # Scatter the monthly counts into one (pairs x 13) matrix; each pair's
+    # monthly_checklist_counts is a row view of it. Tab cannot occur inside
+    # a TSV field, so it is a safe separator for the composite key.
+    pair_index = pc.index_in(
+        pc.binary_join_element_wise(
+            *[result[k].cast(pa.string()) for k in pair_keys], '\t'
+        ),
+        value_set=pc.binary_join_element_wise(
+            *[pairs[k].cast(pa.string()) for k in pair_keys], '\t'
+        ),
     )
+    monthly = np.zeros((pairs.num_rows, 13), dtype=np.int32)
+    monthly[
+        pair_index.to_numpy(),
+        result['month'].to_numpy(),
+    ] = result['checklist_count'].to_numpy()
+
+    for i, (species, loc_id, n_checklists, sci_name, total, max_count) in enumerate(zip(
+        pairs['COMMON NAME'].to_pylist(),
+        pairs['LOCALITY ID'].to_pylist(),
+        pairs['checklist_count_sum'].to_pylist(),
+        pairs['scientific_name_min'].to_pylist(),
+        pairs['total_count_sum'].to_pylist(),
+        pairs['max_count_max'].to_pylist(),
+    )):
+        species_detections[species][loc_id] = {
+            'scientific_name': sci_name,
+            'checklist_count': n_checklists,
+            'monthly_checklist_counts': monthly[i],
+            'total_count': total or 0,
+            'max_count': max_count or 0,
+        }
 
-    rows_processed = 0
-    with tqdm(total=total_rows, desc="Reading main file") as pbar:
-        for chunk in chunks:
-            # Filter for:
-            # - Hotspots only (LOCALITY TYPE = 'H')
-            # - Complete checklists (ALL SPECIES REPORTED = 1)
-            # - Species-level taxa only (CATEGORY = 'species')
-            mask = (
-                (chunk['LOCALITY TYPE'] == 'H') &
-                (chunk['ALL SPECIES REPORTED'] == 1) &
-                (chunk['CATEGORY'] == 'species')
-            )
-            filtered = chunk[mask]
-
-            # Parse dates
-            filtered = filtered.copy()
-            filtered['month'] = pd.to_datetime(filtered['OBSERVATION DATE']).dt.month
-
-            # Process each observation
-            for _, row in filtered.iterrows():
-                species = row['COMMON NAME']
-                sci_name = row['SCIENTIFIC NAME']
-                loc_id = row['LOCALITY ID']
-                checklist_id = row['SAMPLING EVENT IDENTIFIER']
-                month = row['month']
-
-                data = species_detections[species][loc_id]
-                data['scientific_name'] = sci_name
-                data['checklist_ids'].add(checklist_id)
-                data['monthly_checklist_ids'][month].add(checklist_id)
-
-                # Handle observation count (can be 'X' for presence-only)
-                obs_count = row['OBSERVATION COUNT']
-                if obs_count != 'X' and pd.notna(obs_count):
-                    try:
-                        count = int(obs_count)
-                        data['total_count'] += count
-                        data['max_count'] = max(data['max_count'], count)
-                    except (ValueError, TypeError):
-                        pass
-
-            rows_processed += len(chunk)
-            pbar.update(len(chunk))
-
-    # Convert defaultdicts to regular dicts for easier handling
-    return {
-        species: dict(hotspots)
-        for species, hotspots in species_detections.items()
-    }
+    # The per-species values are already plain dicts, and a defaultdict reads
+    # like any other dict downstream, so it is returned as is
+    return species_detections
@@ -0,0 +1,174 @@
+"""Stream eBird TSV files as Arrow record batches, with a Parquet cache."""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from tqdm import tqdm
+
+from config import READ_BLOCK_SIZE, CACHE_DIR
+
+# Bump when the layout of cached parts or the manifest changes, so caches
+# written by older code are rebuilt rather than reused
+CACHE_FORMAT_VERSION = 2
+
+# Explicit types for the columns we read; anything else is read as a string.
+# Types must be fixed up front because the streaming reader only infers them
+# from the first block (e.g. OBSERVATION COUNT may not contain 'X' until later).
+# Low-cardinality and group-key columns are dictionary-encoded while parsing,
+# so each row holds an int32 index instead of a copy of the string.
+COLUMN_TYPES = {
+    'ALL SPECIES REPORTED': pa.int8(),
+    'LOCALITY TYPE': pa.dictionary(pa.int32(), pa.string()),
+    'CATEGORY': pa.dictionary(pa.int32(), pa.string()),
+    'COMMON NAME': pa.dictionary(pa.int32(), pa.string()),
+    'LOCALITY ID': pa.dictionary(pa.int32(), pa.string()),
+    'LATITUDE': pa.float64(),
+    'LONGITUDE': pa.float64(),
+}
+
+
+def read_tsv_batches(path: Path, columns: List[str], desc: str) -> Iterator[pa.RecordBatch]:
+    """
+    Yield record batches of the given columns from an eBird TSV file.
+
+    Parsing is done by PyArrow's multithreaded CSV reader. Progress is
+    reported in bytes read, so the file is only scanned once.
+
+    Args:
+        path: Path to the tab-separated eBird file
+        columns: Column names to read
+        desc: Progress bar label
+
+    Yields:
+        pyarrow.RecordBatch with the requested columns
+    """
+    column_types = {col: COLUMN_TYPES.get(col, pa.string()) for col in columns}
+
+    with open(path, 'rb') as f, tqdm(
+        total=path.stat().st_size, unit='B', unit_scale=True, desc=desc
+    ) as pbar:
+        reader = pv.open_csv(
+            f,
+            read_options=pv.ReadOptions(block_size=READ_BLOCK_SIZE),
+            parse_options=pv.ParseOptions(delimiter='\t'),
+            convert_options=pv.ConvertOptions(
+                include_columns=columns,
+                column_types=column_types,
+            ),
+        )
+
+        last_pos = 0
+        for batch in reader:
+            yield batch
+
+            pos = f.tell()
+            pbar.update(pos - last_pos)
+            last_pos = pos
+
+
+def _cached_parts(manifest_path: Path, manifest: Dict[str, Any]) -> Optional[List[Path]]:
+    """
+    Return the cache's part files if it can be reused, otherwise None.
+
+    The cache is reused only if its manifest matches and every part has a
+    readable Parquet footer, so a missing or truncated part is rebuilt
+    rather than failing partway through the read.
+    """
+    try:
+        cached = json.loads(manifest_path.read_text(encoding='utf-8'))
+        parts = cached.pop('parts', 0)
+        if cached != manifest:
+            return None
+        part_paths = [manifest_path.parent / f'part-{i}.parquet' for i in range(parts)]
+        for part_path in part_paths:
+            pq.read_metadata(part_path)
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    return part_paths
+
+
+def read_filtered_batches(
+    path: Path,
+    columns: List[str],
+    row_filter: Callable[[pa.RecordBatch], pa.Array],
+    filter_version: int,
+    cache_name: str,
+    desc: str,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Yield the rows of an eBird TSV file that pass row_filter, using a cache.
+
+    The first run parses the TSV and writes each filtered batch to
+    CACHE_DIR/<cache_name>/part-<i>.parquet. The cache's manifest.json is
+    written only after the whole file has been read. Later runs read the
+    Parquet parts and skip the TSV entirely, as long as the manifest still
+    matches the source file's size and mtime, the requested columns and
+    their types, the row filter and the cache format, and every part is
+    readable.
+
+    Args:
+        path: Path to the tab-separated eBird file
+        columns: Column names to read
+        row_filter: Function returning a boolean mask for a batch
+        filter_version: Version of row_filter; bump it whenever the filter's
+            logic changes so existing caches are rebuilt
+        cache_name: Name of the cache directory under CACHE_DIR
+        desc: Progress bar label
+
+    Yields:
+        pyarrow.RecordBatch of filtered rows
+    """
+    cache_dir = CACHE_DIR / cache_name
+    manifest_path = cache_dir / 'manifest.json'
+    stat = path.stat()
+    manifest = {
+        'format_version': CACHE_FORMAT_VERSION,
+        'source': str(path.resolve()),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'columns': columns,
+        'column_types': {
+            col: str(COLUMN_TYPES.get(col, pa.string())) for col in columns
+        },
+        'filter': f'{row_filter.__module__}.{row_filter.__qualname__}',
+        'filter_version': filter_version,
+    }
+
+    part_paths = _cached_parts(manifest_path, manifest)
+    if part_paths is not None:
+        for part_path in tqdm(part_paths, unit='part', desc=f"{desc} (cached)"):
+            yield from pq.read_table(part_path).to_batches()
+        return
+
+    # Missing, stale or damaged cache: rebuild it from the TSV
+    if cache_dir.exists():
+        shutil.rmtree(cache_dir)
+    cache_dir.mkdir(parents=True)
+
+    parts = 0
+    for batch in read_tsv_batches(path, columns, desc):
+        filtered = batch.filter(row_filter(batch))
+        pq.write_table(
+            pa.Table.from_batches([filtered]),
+            cache_dir / f'part-{parts}.parquet',
+            compression='zstd',
+        )
+        parts += 1
+        yield filtered
+
+    manifest['parts'] = parts
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+
+def remove_unused_caches(keep: List[str]) -> None:
+    """Delete cache directories under CACHE_DIR other than those in keep."""
+    if not CACHE_DIR.exists():
+        return
+    for cache_dir in CACHE_DIR.iterdir():
+        if cache_dir.is_dir() and cache_dir.name not in keep:
+            shutil.rmtree(cache_dir)
@@ -8,22 +8,38 @@ Usage:
     python validate.py
 """
 
-import json
+import os
 import sys
 from pathlib import Path
+from typing import Any, List
+
+import orjson
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import OUTPUT_DIR
 
 
+def load_json(path: Path) -> Any:
+    """Parse a JSON output file with orjson."""
+    return orjson.loads(path.read_bytes())
+
+
+def list_json_files(directory: Path) -> List[Path]:
+    """List the JSON files in a directory with a single scandir pass."""
+    if not directory.is_dir():
+        return []
+    with os.scandir(directory) as entries:
+        return [Path(e.path) for e in entries if e.name.endswith('.json')]
+
+
 def validate_occurrence_rates(species_dir: Path) -> bool:
     """Verify all occurrence rates are between 0 and 1."""
     errors = []
+    json_files = list_json_files(species_dir)
 
-    for json_file in species_dir.glob("*.json"):
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    for json_file in json_files:
+        data = load_json(json_file)
 
         species_name = data['species']['common_name']
 
@@ -52,7 +68,7 @@ def validate_occurrence_rates(species_dir: Path) -> bool:
             print(f"  ... and {len(errors) - 10} more errors")
         return False
 
-    print(f"PASS: All occurrence rates valid in {len(list(species_dir.glob('*.json')))} species files")
+    print(f"PASS: All occurrence rates valid in {len(json_files)} species files")
     return True
 
 
@@ -69,11 +85,8 @@ def validate_hotspot_coverage(index_dir: Path) -> bool:
         print("FAIL: species_index.json not found")
         return False
 
-    with open(hotspot_index, 'r', encoding='utf-8') as f:
-        hotspots = json.load(f)
-
-    with open(species_index, 'r', encoding='utf-8') as f:
-        species = json.load(f)
+    hotspots = load_json(hotspot_index)
+    species = load_json(species_index)
 
     print(f"Hotspots processed: {hotspots['total_hotspots']}")
     print(f"Species processed: {species['total_species']}")
@@ -103,8 +116,7 @@ def spot_check_common_species(species_dir: Path) -> bool:
             print(f"WARNING: Common species file not found: {species_file}.json")
             continue
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(filepath)
 
         name = data['species']['common_name']
         hotspot_count = data['summary']['total_hotspots_detected']
@@ -135,11 +147,10 @@ def validate_json_structure(species_dir: Path) -> bool:
     required_hotspot_fields = ['rank', 'locality_id', 'name', 'coordinates', 'occurrence']
 
     errors = []
-    sample_files = list(species_dir.glob("*.json"))[:10]
+    sample_files = list_json_files(species_dir)[:10]
 
     for json_file in sample_files:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(json_file)
 
         for field in required_species_fields:
             if field not in data: